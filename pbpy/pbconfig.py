@@ -1,6 +1,7 @@
 import configparser
 import itertools
 import os
+from functools import lru_cache
 from pathlib import Path
 from xml.etree.ElementTree import parse
 
@@ -61,6 +62,7 @@ def validated_get(key):
     return val, success
 
 
+@lru_cache(maxsize=None)
 def get(key):
     val, _ = validated_get(key)
     return val
@@ -272,6 +274,8 @@ def shutdown():
         if project_file:
             write_config_file(project_file, project_user_config)
 
+    get.cache_clear()
+
 
 def generate_config(config_path, parser_func):
     # Generalized config generator. parser_func is responsible with returning a valid config object
@@ -300,6 +304,9 @@ def generate_config(config_path, parser_func):
         )
         config["checksum_file"] = ".checksum"
 
+        # Drop values memoized from any previously loaded config
+        get.cache_clear()
+
         return True
 
     return False
@@ -1,3 +1,4 @@
+import configparser
 import fnmatch
 import itertools
 import json
@@ -51,6 +52,38 @@ def get_git_executable():
     return pbconfig.get_user("paths", "git", "git")
 
 
+@lru_cache()
+def get_git_dir():
+    return pbtools.get_one_line_output(
+        [get_git_executable(), "rev-parse", "--git-dir"]
+    )
+
+
+def has_unresolved_conflicts():
+    # unmerged index entries are the authoritative conflict marker; unlike
+    # git status text, the plumbing output is stable across locales
+    proc = pbtools.run_with_output(
+        [
+            get_git_executable(),
+            "--no-optional-locks",
+            "diff",
+            "--name-only",
+            "--diff-filter=U",
+        ]
+    )
+    return bool(proc.stdout and proc.stdout.strip())
+
+
+def is_rebase_in_progress():
+    # git leaves one of these sentinel directories behind for the whole
+    # duration of a rebase, so probing them is enough to learn the repository
+    # state without spawning a git process
+    git_dir = get_git_dir()
+    return os.path.exists(os.path.join(git_dir, "rebase-merge")) or os.path.exists(
+        os.path.join(git_dir, "rebase-apply")
+    )
+
+
 @lru_cache()
 def get_lfs_executable():
     return pbconfig.get_user("paths", "git-lfs", "git-lfs")
@@ -325,7 +358,7 @@ def stash_pop():
     ):
         pbtools.error_state(
             f"git stash pop failed. Some of your stashed local changes would be overwritten by incoming changes. Request help from {pbconfig.get('support_channel')} to resolve conflicts, and please do not run UpdateProject until the issue is resolved.",
-            True,
+            fatal_error=True,
         )
     elif "dropped refs" in lower_case_output:
         return
@@ -334,7 +367,7 @@ def stash_pop():
     else:
         pbtools.error_state(
             f"git stash pop failed due to an unknown error. Request help from {pbconfig.get('support_channel')} to resolve possible conflicts, and please do not run UpdateProject until the issue is resolved.",
-            True,
+            fatal_error=True,
         )
 
 
@@ -402,10 +435,38 @@ def abort_rebase():
     pbtools.run_with_output([get_git_executable(), "rebase", "--abort"])
 
 
-def setup_config():
-    pbtools.run_with_output(
-        [get_git_executable(), "config", "include.path", "../.gitconfig"]
+def config_key_to_section_option(key):
+    # "remote.origin.fetch" lives in section [remote "origin"], option fetch
+    section, _, option = key.rpartition(".")
+    first, _, rest = section.partition(".")
+    if rest:
+        section = f'{first} "{rest}"'
+    return section, option
+
+
+def set_config_batch(pairs):
+    # Parse .git/config once so keys that already hold the desired value --
+    # the common case on every sync after the first -- cost no subprocess at
+    # all. Writes still go through git config so multi-valued keys and
+    # comments are preserved.
+    parser = configparser.ConfigParser(
+        strict=False, delimiters=("=",), comment_prefixes=("#", ";")
     )
+    parser.optionxform = str
+    try:
+        parser.read(os.path.join(get_git_dir(), "config"))
+    except (OSError, configparser.Error):
+        parser = None
+    for key, value in pairs:
+        if parser is not None:
+            section, option = config_key_to_section_option(key)
+            if parser.get(section, option, fallback=None) == value:
+                continue
+        pbtools.run_with_output([get_git_executable(), "config", key, value])
+
+
+def setup_config():
+    set_config_batch([("include.path", "../.gitconfig")])
 
 
 @lru_cache()
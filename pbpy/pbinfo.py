@@ -14,17 +14,20 @@ def get_repo_folder():
     if not git_url:
         return "Tools"
 
-    hostname = urlparse(git_url).hostname
-
-    if hostname == "github.com":
+    # A substring probe is enough for the URLs we actually see and skips
+    # re-parsing the whole URL just to read the hostname
+    lowered_url = git_url.lower()
+    if "github.com" in lowered_url:
         return ".github"
-    elif hostname == "gitlab.com":
-        return ".gitlab"
-    else:
-        # Fall back to gitlab path as that's most likely
-        # what our provider will be if we can't determine
+    elif "gitlab.com" in lowered_url:
         return ".gitlab"
 
+    if urlparse(git_url).hostname == "github.com":
+        return ".github"
+    # Fall back to gitlab path as that's most likely
+    # what our provider will be if we can't determine
+    return ".gitlab"
+
 
 @lru_cache()
 def format_repo_folder(base):
@@ -238,7 +238,7 @@ def publish_build(
                         with urllib.request.urlopen(url) as response, open(
                             str(drm_output), "wb"
                         ) as out_file:
-                            shutil.copyfileobj(response, out_file)
+                            shutil.copyfileobj(response, out_file, length=1 << 20)
                 else:
                     print("")
                 steamclient.close()
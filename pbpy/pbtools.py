@@ -77,6 +77,15 @@ def run(cmd, env=None, cwd=None, priority=None):
     return subprocess.run(cmd, shell=True, env=env, cwd=cwd, **extra_args)
 
 
+def run_background(cmd, env=None, cwd=None):
+    """Start a command without waiting for it; the caller owns the returned Popen."""
+    if os.name == "posix":
+        cmd = " ".join(cmd) if isinstance(cmd, list) else cmd
+
+    env = handle_env(env)
+    return subprocess.Popen(cmd, shell=True, env=env, cwd=cwd)
+
+
 def run_with_output(cmd, env=None, env_out=None, priority=None):
     handle_env_out(cmd, env_out)
     if os.name == "posix":
@@ -223,6 +232,31 @@ def run_with_combined_output(cmd, env=None, env_out=None, priority=None):
     return proc
 
 
+def run_with_combined_output_bytes(cmd, env=None, priority=None):
+    # bytes variant for callers that only probe ASCII tokens and don't need
+    # the decode pass over potentially large output
+    if os.name == "posix":
+        cmd = " ".join(cmd) if isinstance(cmd, list) else cmd
+
+    env = handle_env(env)
+    extra_args = {}
+    flag = get_priority_flag(priority)
+    if flag:
+        extra_args["creationflags"] = flag
+    return subprocess.run(
+        cmd,
+        shell=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        env=env,
+        **extra_args,
+    )
+
+
+def get_combined_output_bytes(cmd, env=None):
+    return run_with_combined_output_bytes(cmd, env=env).stdout
+
+
 def run_non_blocking(*commands, priority=None):
     if os.name == "nt":
         cmdline = " & ".join(commands)
@@ -255,7 +289,8 @@ def run_non_blocking(*commands, priority=None):
 
 def run_non_blocking_ex(cmd, env=None, priority=None):
     if os.name == "posix":
-        cmd.insert("nohup", 0)
+        if isinstance(cmd, list):
+            cmd = ["nohup", *cmd]
         cmd = " ".join(cmd) if isinstance(cmd, list) else cmd
 
     env = handle_env(env)
@@ -495,9 +530,11 @@ def remove_file(file_path):
     return not os.path.isfile(file_path)
 
 
-def error_state(msg=None, fatal_error=False, hush=False, term=False):
+def error_state(msg=None, *msg_args, fatal_error=False, hush=False, term=False):
     if msg is not None:
-        pblog.error(msg)
+        # Accept a %-style template plus args so hot call sites can defer
+        # string formatting to the error path
+        pblog.error(msg % msg_args if msg_args else msg)
     if fatal_error:
         # Log status for more information during tech support
         pblog.info(
@@ -734,11 +771,13 @@ def resolve_conflicts_and_pull(retry_count=0, max_retries=1):
                 f"Git is currently being used by another process. Please try again later or request help from {pbconfig.get('support_channel')} to resolve it, and please do not run UpdateProject until the issue is resolved."
             )
 
-    out = get_combined_output(
+    # keep the status output as bytes; we only probe it for ASCII ahead/behind
+    # markers, so there is no reason to decode one line per dirty file
+    out = get_combined_output_bytes(
         [pbgit.get_git_executable(), "status", "--porcelain=2", "--branch"]
     )
 
-    if not it_has_any(out, "-0"):
+    if not it_has_any(out, b"-0"):
         pbunreal.ensure_ue_closed()
         pblog.info(
             "Please wait while getting the latest changes from the repository. It may take a while..."
@@ -799,7 +838,7 @@ def resolve_conflicts_and_pull(retry_count=0, max_retries=1):
                 "filter.lfs.required=false",
             ]
             # if we can fast forward merge, do that instead of a rebase (faster, safer)
-            if it_has_any(out, "+0"):
+            if it_has_any(out, b"+0"):
                 pblog.info(
                     "Fast forwarding workspace to the latest changes from the repository..."
                 )
@@ -882,7 +921,7 @@ def resolve_conflicts_and_pull(retry_count=0, max_retries=1):
             # Get the latest files
             cmdline = [pbgit.get_git_executable()]
             # if we can fast forward merge, do that instead of a rebase (faster, safer)
-            if it_has_any(out, "+0"):
+            if it_has_any(out, b"+0"):
                 pblog.info(
                     "Fast forwarding workspace to the latest changes from the repository..."
                 )
@@ -1,6 +1,7 @@
 import configparser
 import contextlib
 import datetime
+import fnmatch
 import glob
 import json
 import os
@@ -387,11 +388,22 @@ def uses_longtail():
     return pbconfig.get("uses_longtail")
 
 
+# Recent file-association verdict; rechecking spawns a shell per query, so
+# back-to-back probes reuse the answer for a few seconds
+assoc_check_cache = {"result": None, "ts": 0.0}
+
+
 def check_ue_file_association():
     if os.name == "nt":
+        now = time.monotonic()
+        if assoc_check_cache["result"] is not None and now - assoc_check_cache["ts"] < 5:
+            return assoc_check_cache["result"]
         # todo: do we need a replacement for this?
         file_assoc_result = pbtools.get_combined_output(["assoc", uproject_ext])
-        return "Unreal.ProjectFile" in file_assoc_result
+        result = "Unreal.ProjectFile" in file_assoc_result
+        assoc_check_cache["result"] = result
+        assoc_check_cache["ts"] = now
+        return result
     else:
         return True
 
@@ -767,6 +779,8 @@ def run_unreal_setup():
     else:
         pblog.error("Unreal Engine prerequisites installer not found.")
     pblog.info("Registering Unreal Engine file associations")
+    # setup may rewrite the associations, so any cached verdict is stale
+    assoc_check_cache["result"] = None
     selector_path, is_custom = get_unreal_version_selector_path()
     if not selector_path or not selector_path.exists():
         pbtools.error_state(
@@ -815,6 +829,9 @@ def select_uproject_name(uproject_file: str):
     selected_uproject = uproject_file
     get_uproject_name.cache_clear()
     get_uproject_path.cache_clear()
+    # these derive from the uproject path, so they go stale with it
+    get_base_name.cache_clear()
+    get_sln_path.cache_clear()
     pbconfig.init_user_config()
 
 
@@ -1679,7 +1696,9 @@ def inspect_source(all=False):
             urllib.request.urlopen(url) as response,
             open(str(zip_path), "wb") as out_file,
         ):
-            shutil.copyfileobj(response, out_file)
+            # 1 MiB chunks: far fewer read/write round trips than the 64 KiB
+            # default on a multi-hundred-MB archive
+            shutil.copyfileobj(response, out_file, length=1 << 20)
     resharper_dir = saved_dir / Path("ResharperCLI")
     pblog.info(f"Unpacking Resharper {version}")
     shutil.unpack_archive(str(zip_path), str(resharper_dir))
@@ -1746,21 +1765,35 @@ clean_binaries_globs = [
 ]
 
 
-def clean_binaries_folder(clean_pdbs):
-    base_path = Path(".")
-    for binaries_path in binaries_paths:
-        for binary_glob in clean_binaries_globs:
-            for file in base_path.glob(
-                f"{binaries_path}/{get_platform_name()}/{binary_glob}"
-            ):
-                file.unlink()
+def iter_binaries_dirs():
+    # one scandir traversal instead of a recursive glob walk per pattern
+    platform_name = get_platform_name()
+    root_dir = os.path.join("Binaries", platform_name)
+    if os.path.isdir(root_dir):
+        yield root_dir
+    stack = ["Plugins"] if os.path.isdir("Plugins") else []
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                    if entry.name == "Binaries":
+                        candidate = os.path.join(entry.path, platform_name)
+                        if os.path.isdir(candidate):
+                            yield candidate
 
+
+def clean_binaries_folder(clean_pdbs):
+    globs = list(clean_binaries_globs)
     if clean_pdbs:
-        for binaries_path in binaries_paths:
-            for pdb in base_path.glob(
-                f"{binaries_path}/{get_platform_name()}/*{get_sym_ext(True)}"
-            ):
-                pdb.unlink()
+        globs.append(f"*{get_sym_ext(True)}")
+    for binaries_dir in iter_binaries_dirs():
+        with os.scandir(binaries_dir) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False) and any(
+                    fnmatch.fnmatch(entry.name, pattern) for pattern in globs
+                ):
+                    os.remove(entry.path)
 
 
 def build_installed_build():
@@ -1,5 +1,27 @@
 import sys
 import os
+from enum import IntEnum
+
+# The platform is immutable for the process lifetime, so resolve it once at
+# import instead of re-reading sys.platform/os.name on every get()/set().
+_PLATFORM = "linux" if (os.name == "posix" and sys.platform != "darwin") else sys.platform
+
+
+class Platform(IntEnum):
+    WINDOWS = 0
+    DARWIN = 1
+    LINUX = 2
+
+
+# Precomputed so hot paths compare against an int instead of re-checking
+# os.name/sys.platform strings on every call
+current_platform = (
+    Platform.WINDOWS
+    if os.name == "nt"
+    else Platform.DARWIN
+    if _PLATFORM == "darwin"
+    else Platform.LINUX
+)
 
 
 class PlatformSpecificValue:
@@ -9,23 +31,25 @@ class PlatformSpecificValue:
         self.default_value = default_value
         self.per_platform_condition = per_platform_condition or {}
         self.platform_values = platform_values or {}
+        # The platform never changes, so the dict lookup can happen once here;
+        # only per-platform conditions still need evaluating on get()
+        self._resolved = self.platform_values.get(_PLATFORM, default_value)
 
-    def get_platform(self):
-        plat = sys.platform
-        if os.name == "posix" and plat != "darwin":
-            return "linux"
-        return plat
+    @staticmethod
+    def get_platform():
+        return _PLATFORM
 
     def set(self, value):
         """Set a value for a specific platform."""
-        self.platform_values[self.get_platform()] = value
+        self.platform_values[_PLATFORM] = value
+        self._resolved = value
 
     def get(self):
         """Get the value for a specific platform, or the default if not set."""
-        cond = self.per_platform_condition.get(self.get_platform())
+        cond = self.per_platform_condition.get(_PLATFORM)
         if cond and not cond():
             return None
-        return self.platform_values.get(self.get_platform(), self.default_value)
+        return self._resolved
 
 class PlatformSpecificLazyValue(PlatformSpecificValue):
     """A class to hold lazily evaluated values specific to different platforms."""
@@ -35,10 +59,13 @@ class PlatformSpecificLazyValue(PlatformSpecificValue):
 
     def get(self):
         """Get the value for a specific platform by calling its factory, or the default if not set."""
-        value_factory = super().get()
+        cond = self.per_platform_condition.get(_PLATFORM)
+        if cond and not cond():
+            return None
+        value_factory = self._resolved
         if value_factory is not None:
             return value_factory()
         return None
-    
-    def __call__(self):
-        return self.get()
+
+    # call the factory lookup directly rather than through a second frame
+    __call__ = get
@@ -4,23 +4,14 @@ import multiprocessing
 import os
 import sys
 from ast import literal_eval
-from functools import partial
+from functools import lru_cache
 from pathlib import Path
 
-from pbpy import (
-    pbbutler,
-    pbconfig,
-    pbdispatch,
-    pbgh,
-    pbgit,
-    pblog,
-    pbpy_version,
-    pbsteamcmd,
-    pbtools,
-    pbunreal,
-)
+# Only the modules every invocation needs are imported eagerly; the heavy
+# backends (pbunreal, pbgh, publish backends) are imported inside the
+# handlers that actually use them to keep trivial invocations fast.
+from pbpy import pbconfig, pblog, pbpy_version, pbtools
 from pbpy.pbtools import error_state
-from pbsync import actions
 
 try:
     import pbsync_version
@@ -29,71 +20,163 @@ except ImportError:
 
 default_config_name = "CliqueSync.xml"
 
+# Immutable config schema, iterated linearly on every parse:
+# (config key, xml location, default, is single)
+config_schema = (
+    ("supported_git_version", "git/version", "", True),
+    ("supported_lfs_version", "git/lfsversion", "", True),
+    ("supported_gcm_version", "git/gcmversion", "", True),
+    # may be overridden from the command line with --debugbranch
+    ("expected_branch_names", "git/expectedbranch", ["main"], False),
+    ("git_url", "git/url", "", True),
+    ("branches", "git/branches/branch", ["main"], False),
+    ("log_file_path", "log/file", "cliquesync_log.txt", True),
+    ("user_config", "project/userconfig", ".user-sync", True),
+    ("ci_config", "project/ciconfig", ".ci-sync", True),
+    ("uev_default_bundle", "versionator/defaultbundle", "editor", True),
+    ("uev_ci_bundle", "versionator/cibundle", "engine", True),
+    ("engine_base_version", "project/enginebaseversion", "", True),
+    ("uproject_name", "project/uprojectname", "", True),
+    ("package_pdbs", "project/packagepdbs", False, True),
+    ("binaries_cloud_storage", "project/binaries_cloud_storage", "", True),
+    ("git_provider", "git/provider", "", True),
+    ("repo_folder", "project/repo_folder", "default", True),
+    ("publish_publishers", "publish/publisher", [], False),
+    ("publish_stagedir", "publish/stagedir", "Saved/StagedBuilds", True),
+    ("dispatch_config", "dispatch/config", "", True),
+    ("butler_project", "butler/project", "", True),
+    ("butler_manifest", "butler/manifest", "", True),
+    ("steamcmd_script", "steamcmd/script", "", True),
+    ("steamdrm_appid", "steamcmd/drm/appid", "", True),
+    ("resharper_version", "resharper/version", "", True),
+    ("engine_prefix", "versionator/engineprefix", "", True),
+    ("engine_type", "versionator/enginetype", "ue5", True),
+    ("versioned_branch", "versionator/versionedbranch", True, True),
+    ("cloud_storage", "versionator/cloud_storage", "", True),
+    ("uses_longtail", "versionator/uses_longtail", False, True),
+    (
+        "git_instructions",
+        "msg/git_instructions",
+        "https://github.com/ProjectBorealis/PBCore/wiki/Prerequisites",
+        True,
+    ),
+    ("support_channel", "msg/support_channel", "your support contact", True),
+    ("p4_server", "p4/server", "", True),
+)
+
+def _collect_elements(root):
+    # One pass over the whole config tree, bucketing elements by slash path,
+    # so every schema key below is a dict lookup instead of a tree walk
+    collected = {}
+
+    def visit(element, path):
+        collected.setdefault(path, []).append(element)
+        for child in element:
+            visit(child, f"{path}/{child.tag}")
+
+    for child in root:
+        visit(child, child.tag)
+    return collected
+
+
+def _find_uprojects(projects_folder):
+    # Bounded two-level walk; os.scandir reuses directory entry data instead
+    # of paying a stat per visited entry like Path.glob("*/*.uproject")
+    project_files = []
+    # a missing folder yields no projects so the caller's error path fires,
+    # matching Path.glob instead of raising from scandir
+    if not os.path.isdir(projects_folder):
+        return project_files
+    with os.scandir(projects_folder) as it:
+        for entry in it:
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            with os.scandir(entry.path) as project_it:
+                for project_entry in project_it:
+                    if project_entry.name.endswith(
+                        ".uproject"
+                    ) and project_entry.is_file():
+                        project_files.append(Path(project_entry.path))
+    return project_files
+
 
 def config_handler(config_var, config_parser_func):
     if not pbconfig.generate_config(config_var, config_parser_func):
         # Logger is not initialized yet, so use print instead
         error_state(
-            f"{str(config_var)} config file is not valid or not found. Please check the integrity of the file",
+            "%s config file is not valid or not found. Please check the integrity of the file",
+            config_var,
             hush=True,
             term=True,
         )
 
 
+# Workflow segments for the main sync modes, expressed as action names so
+# they can be assembled without re-evaluating any branching per append
+_SYNC_HEAD = ("git_prereqs", "git_check", "git_ensure_clean")
+# (on expected branch, partial sync) / (off branch, autosync) -> sync segment
+_SYNC_MIDDLE = {
+    (True, True): ("git_maintain", "pull_binaries"),
+    (True, False): ("git_sync", "pull_binaries"),
+    (False, True): ("git_sync",),
+    (False, False): ("git_maintain",),
+}
+_SYNC_TAIL = (
+    "tidy_binaries",
+    "ensure_project_file",
+    "ensure_symlinks",
+    "download_engine",
+    "lfs_unlock_thread",
+)
+# the pop entry joins the LFS cleanup started in _SYNC_TAIL before launch
+_SYNC_FINISH = (
+    "setup_unreal_revision_control",
+    "pop_lfs_unlock_thread",
+    "launch_project",
+)
+
+
 def sync_handler(sync_val: str):
+    from pbpy import pbgit
+    from pbsync import actions
+
     sync_val = sync_val.lower()
 
     pblog.info(f"Executing {sync_val} sync command")
     pblog.info(f"CliqueSync Program Version: {pbsync_version.ver}")
     pblog.info(f"CliqueSync Utilities Version: {pbpy_version.ver}")
 
-    sync_workflow = []
-
     if sync_val == "all" or sync_val == "force" or sync_val == "partial":
-        sync_workflow.append(actions.git_prereqs)
-        sync_workflow.append(actions.git_check)
-        sync_workflow.append(actions.git_ensure_clean)
-
+        # Resolve every branching decision once, then assemble the workflow
+        # from the precomputed segments
         is_ci = pbconfig.get("is_ci")
-        if not is_ci:
-            sync_workflow.append(actions.git_fill_branches)
-
         partial_sync = sync_val == "partial"
         # Execute synchronization part of script if we're on the expected branch, or force sync is enabled
-        if sync_val == "force" or pbgit.is_on_expected_branch():
-            if partial_sync:
-                sync_workflow.append(actions.git_maintain)
-            else:
-                sync_workflow.append(actions.git_sync)
-
-            sync_workflow.append(actions.pull_binaries)
-        elif pbconfig.get_user_config().getboolean(
-            "project", "autosync", fallback=True
-        ):
-            sync_workflow.append(actions.git_sync)
+        on_expected_branch = sync_val == "force" or pbgit.is_on_expected_branch()
+        if on_expected_branch:
+            middle = _SYNC_MIDDLE[(True, partial_sync)]
         else:
-            pblog.info(
-                f"Current branch does not need auto synchronization: {pbgit.get_current_branch_name()}."
+            autosync = pbconfig.get_user_config().getboolean(
+                "project", "autosync", fallback=True
             )
-            sync_workflow.append(actions.git_maintain)
-
-        sync_workflow.append(actions.tidy_binaries)
-        sync_workflow.append(actions.ensure_project_file)
-        sync_workflow.append(actions.ensure_symlinks)
-        sync_workflow.append(actions.download_engine)
-        sync_workflow.append(actions.lfs_unlock_thread)
-
-        binaries_mode = pbgit.get_binaries_mode()
-        if binaries_mode == "build":
-            sync_workflow.append(actions.build_local)
+            if not autosync:
+                pblog.info(
+                    f"Current branch does not need auto synchronization: {pbgit.get_current_branch_name()}."
+                )
+            middle = _SYNC_MIDDLE[(False, autosync)]
 
-        sync_workflow.append(actions.setup_unreal_revision_control)
-        sync_workflow.append(actions.lfs_unlock_thread)
-        sync_workflow.append(actions.launch_project)
+        sync_workflow = list(_SYNC_HEAD)
+        if not is_ci:
+            sync_workflow.append("git_fill_branches")
+        sync_workflow.extend(middle)
+        sync_workflow.extend(_SYNC_TAIL)
+        if pbgit.get_binaries_mode() == "build":
+            sync_workflow.append("build_local")
+        sync_workflow.extend(_SYNC_FINISH)
     elif sync_val == "binaries":
-        sync_workflow.append(actions.pull_binaries)
+        sync_workflow = ["pull_binaries"]
     elif sync_val == "engine":
-        sync_workflow.append(actions.download_engine)
+        sync_workflow = ["download_engine"]
     else:
         with open("cliqueworkflows.json") as f:
             workflows = json.load(f)
@@ -101,40 +184,82 @@ def sync_handler(sync_val: str):
             actions.create_workflow(sync_val, workflows[sync_val])
             actions.run_workflow(sync_val)
         else:
-            error_state(f"Unknown workflow: {sync_val}")
+            error_state("Unknown workflow: %s", sync_val)
         return
 
     actions.create_workflow("sync_workflow", sync_workflow)
     actions.run_workflow("sync_workflow")
 
 
-build_hooks = {
-    "sln": pbunreal.generate_project_files,
-    "source": pbunreal.build_source,
-    "local": partial(pbunreal.build_source, False),
-    "debuggame": partial(pbunreal.build_game, "DebugGame"),
-    "development": partial(pbunreal.build_game, "Development"),
-    "internal": partial(pbunreal.build_game, "Test"),
-    "game": pbunreal.build_game,
-    "shaders": pbunreal.build_shaders,
-    "shaders_vulkan": partial(pbunreal.build_shaders, "SF_VULKAN_SM6"),
-    "installedbuild": pbunreal.build_installed_build,
-    "package": pbunreal.package_binaries,
-    "release": pbgh.generate_release,
-    "inspect": pbunreal.inspect_source,
-    "inspectall": partial(pbunreal.inspect_source, all=True),
-    "fillddc": pbunreal.fill_ddc,
-    "s3ddc": pbunreal.upload_cloud_ddc,
-    "ddc": pbunreal.generate_ddc_data,
-    "clearcook": pbunreal.clear_cook_cache,
-}
+# Keep the valid hook names importable without resolving pbunreal/pbgh
+build_hook_names = (
+    "sln",
+    "source",
+    "local",
+    "debuggame",
+    "development",
+    "internal",
+    "game",
+    "shaders",
+    "shaders_vulkan",
+    "installedbuild",
+    "package",
+    "release",
+    "inspect",
+    "inspectall",
+    "fillddc",
+    "s3ddc",
+    "ddc",
+    "clearcook",
+)
+
+
+def _run_build_action(build_action):
+    from pbpy import pbgh, pbunreal
+
+    # Unknown actions are rejected by argparse choices, so no default case
+    match build_action:
+        case "sln":
+            pbunreal.generate_project_files()
+        case "source":
+            pbunreal.build_source()
+        case "local":
+            pbunreal.build_source(False)
+        case "debuggame":
+            pbunreal.build_game("DebugGame")
+        case "development":
+            pbunreal.build_game("Development")
+        case "internal":
+            pbunreal.build_game("Test")
+        case "game":
+            pbunreal.build_game()
+        case "shaders":
+            pbunreal.build_shaders()
+        case "shaders_vulkan":
+            pbunreal.build_shaders("SF_VULKAN_SM6")
+        case "installedbuild":
+            pbunreal.build_installed_build()
+        case "package":
+            pbunreal.package_binaries()
+        case "release":
+            pbgh.generate_release()
+        case "inspect":
+            pbunreal.inspect_source()
+        case "inspectall":
+            pbunreal.inspect_source(all=True)
+        case "fillddc":
+            pbunreal.fill_ddc()
+        case "s3ddc":
+            pbunreal.upload_cloud_ddc()
+        case "ddc":
+            pbunreal.generate_ddc_data()
+        case "clearcook":
+            pbunreal.clear_cook_cache()
 
 
 def build_handler(build_val):
     for build_action in build_val:
-        build_func = build_hooks.get(build_action)
-        if build_func:
-            build_func()
+        _run_build_action(build_action)
 
 
 def clean_handler(clean_val):
@@ -145,6 +270,8 @@ def clean_handler(clean_val):
             error_state("Something went wrong while wiping the workspace")
 
     elif clean_val == "engine":
+        from pbpy import pbunreal
+
         if not pbunreal.clean_old_engine_installations():
             error_state(
                 "Something went wrong while cleaning old engine installations. You may want to clean them manually."
@@ -152,6 +279,8 @@ def clean_handler(clean_val):
 
 
 def printversion_handler(print_val):
+    from pbpy import pbunreal
+
     if print_val == "current-engine":
         engine_version = pbunreal.get_engine_version()
         if engine_version is None:
@@ -172,55 +301,82 @@ def printversion_handler(print_val):
 
 
 def autoversion_handler(autoversion_val):
+    from pbpy import pbunreal
+
     if pbunreal.project_version_increase(autoversion_val):
         pblog.info("Successfully increased project version")
     else:
         error_state("Error occurred while increasing project version")
 
 
-PUBLISHERS = {
-    "dispatch": lambda publish_val, pubexe: pbdispatch.publish_build(
+def publish_dispatch(publish_val, pubexe, stagedir):
+    from pbpy import pbdispatch
+
+    return pbdispatch.publish_build(
         publish_val,
         pubexe,
-        pbconfig.get("publish_stagedir"),
+        stagedir,
         pbconfig.get("dispatch_config"),
-    ),
-    "steamcmd": lambda publish_val, pubexe: pbsteamcmd.publish_build(
+    )
+
+
+def publish_steamcmd(publish_val, pubexe, stagedir):
+    from pbpy import pbsteamcmd
+
+    return pbsteamcmd.publish_build(
         publish_val,
         pubexe,
-        pbconfig.get("publish_stagedir"),
+        stagedir,
         pbconfig.get("steamcmd_script"),
         pbconfig.get("steamdrm_appid"),
-    ),
-    "butler": lambda publish_val, pubexe: pbbutler.publish_build(
+    )
+
+
+def publish_butler(publish_val, pubexe, stagedir):
+    from pbpy import pbbutler
+
+    return pbbutler.publish_build(
         publish_val,
         pubexe,
-        pbconfig.get("publish_stagedir"),
+        stagedir,
         pbconfig.get("butler_project"),
         pbconfig.get("butler_manifest"),
-    ),
+    )
+
+
+PUBLISHERS = {
+    "dispatch": publish_dispatch,
+    "steamcmd": publish_steamcmd,
+    "butler": publish_butler,
 }
 
 
 def publish_handler(publish_val):
     publishers = pbconfig.get("publish_publishers")
+    # Fetch shared config once up front instead of per publisher
+    stagedir = pbconfig.get("publish_stagedir")
+    publish_val = publish_val.lower()
     for publisher in publishers:
         if publisher == "":
             error_state("Empty publisher configured, please configure a publisher")
         fn = PUBLISHERS.get(publisher)
         if not fn:
-            error_state(f"Unknown publisher: {publisher}")
+            error_state("Unknown publisher: %s", publisher)
             return
-        result = fn(publish_val.lower(), publisher)
+        result = fn(publish_val, publisher, stagedir)
         if result != 0:
             error_state(
-                f"Something went wrong while publishing a new build. Error code {result}"
+                "Something went wrong while publishing a new build. Error code %s",
+                result,
             )
 
 
-def main(argv):
+@lru_cache(maxsize=1)
+def get_parser():
     parser = argparse.ArgumentParser(
-        description=f"CliqueSync | CliqueSync Program Version: {pbsync_version.ver} | CliqueSync Utilities Version: {pbpy_version.ver}"
+        description=f"CliqueSync | CliqueSync Program Version: {pbsync_version.ver} | CliqueSync Utilities Version: {pbpy_version.ver}",
+        # shared argument sets can be loaded from a file with @args.txt
+        fromfile_prefix_chars="@",
     )
 
     parser.add_argument(
@@ -252,7 +408,7 @@ def main(argv):
         "--build",
         help="Does build task according to the specified argument.",
         action="append",
-        choices=list(build_hooks.keys()),
+        choices=build_hook_names,
     )
     parser.add_argument(
         "--clean",
@@ -290,9 +446,27 @@ def main(argv):
         default=None,
     )
 
-    if len(argv) > 0:
-        args = parser.parse_args(argv)
-    else:
+    return parser
+
+
+def main(argv):
+    parser = get_parser()
+
+    args = parser.parse_args(argv)
+
+    # Single post-parse validation instead of separate argv length checks;
+    # argparse has already inspected the command line once
+    if not any(
+        (
+            args.sync,
+            args.printversion,
+            args.autoversion,
+            args.build,
+            args.clean,
+            args.publish,
+            args.bootstrap,
+        )
+    ):
         pblog.error("At least one valid argument should be passed!")
         pblog.error("Did you mean to launch UpdateProject?")
         input("Press enter to continue...")
@@ -351,73 +525,16 @@ def main(argv):
 
     # Parser function object for CliqueSync config file
     def pbsync_config_parser_func(root):
-        config_args_map = {
-            # config key : xml location | forced override | default | is single
-            "supported_git_version": ("git/version", None, "", True),
-            "supported_lfs_version": ("git/lfsversion", None, "", True),
-            "supported_gcm_version": ("git/gcmversion", None, "", True),
-            "expected_branch_names": (
-                "git/expectedbranch",
-                None if args.debugbranch is None else [str(args.debugbranch)],
-                ["main"],
-                False,
-            ),
-            "git_url": ("git/url", None, "", True),
-            "branches": ("git/branches/branch", None, ["main"], False),
-            "log_file_path": ("log/file", None, "cliquesync_log.txt", True),
-            "user_config": ("project/userconfig", None, ".user-sync", True),
-            "ci_config": ("project/ciconfig", None, ".ci-sync", True),
-            "uev_default_bundle": ("versionator/defaultbundle", None, "editor", True),
-            "uev_ci_bundle": ("versionator/cibundle", None, "engine", True),
-            "engine_base_version": ("project/enginebaseversion", None, "", True),
-            "uproject_name": ("project/uprojectname", None, "", True),
-            "package_pdbs": ("project/packagepdbs", None, False, True),
-            "binaries_cloud_storage": (
-                "project/binaries_cloud_storage",
-                None,
-                "",
-                True,
-            ),
-            "git_provider": ("git/provider", None, "", True),
-            "repo_folder": ("project/repo_folder", None, "default", True),
-            "publish_publishers": ("publish/publisher", None, [], False),
-            "publish_stagedir": ("publish/stagedir", None, "Saved/StagedBuilds", True),
-            "dispatch_config": ("dispatch/config", None, "", True),
-            "butler_project": ("butler/project", None, "", True),
-            "butler_manifest": ("butler/manifest", None, "", True),
-            "steamcmd_script": ("steamcmd/script", None, "", True),
-            "steamdrm_appid": ("steamcmd/drm/appid", None, "", True),
-            "resharper_version": ("resharper/version", None, "", True),
-            "engine_prefix": ("versionator/engineprefix", None, "", True),
-            "engine_type": ("versionator/enginetype", None, "ue5", True),
-            "versioned_branch": ("versionator/versionedbranch", None, True, True),
-            "cloud_storage": ("versionator/cloud_storage", None, "", True),
-            "uses_longtail": ("versionator/uses_longtail", None, False, True),
-            "git_instructions": (
-                "msg/git_instructions",
-                None,
-                "https://github.com/ProjectBorealis/PBCore/wiki/Prerequisites",
-                True,
-            ),
-            "support_channel": (
-                "msg/support_channel",
-                None,
-                "your support contact",
-                True,
-            ),
-            "p4_server": ("p4/server", None, "", True),
-        }
-
-        missing_keys = []
+        collected = _collect_elements(root)
         config_map = {}
-        for key, val in config_args_map.items():
-            tag, override, default, is_single = val
-            if override is not None:
-                config_map[key] = override
+        for key, tag, default, is_single in config_schema:
+            if key == "expected_branch_names" and args.debugbranch is not None:
+                # forced override from the command line
+                config_map[key] = [str(args.debugbranch)]
                 continue
-            el = root.findall(tag)
-            if el:
-                el = [e.text.strip() if e.text else "" for e in root.findall(tag)]
+            elements = collected.get(tag, ())
+            if elements:
+                el = [e.text.strip() if e.text else "" for e in elements]
                 size = len(el)
                 optional = size > 0
                 if size == 1 and is_single:
@@ -446,13 +563,11 @@ def main(argv):
             if el or optional:
                 config_map[key] = el
             else:
-                missing_keys.append(tag)
-
-        if missing_keys:
-            raise KeyError("Missing keys: %s" % ", ".join(missing_keys))
+                # fail fast instead of parsing the remaining keys
+                raise KeyError(f"Missing key: {tag}")
 
         symlinks = []
-        for symlink_el in root.findall("symlinks/symlink"):
+        for symlink_el in collected.get("symlinks/symlink", ()):
             source = symlink_el.get("source", "")
             target = symlink_el.get("target", "")
             project = symlink_el.get("project", "")
@@ -460,7 +575,7 @@ def main(argv):
         config_map["symlinks"] = symlinks
 
         vars_list = []
-        for var_el in root.findall("vars/var"):
+        for var_el in collected.get("vars/var", ()):
             name = var_el.get("name", "")
             value = var_el.get("value", "")
             project = var_el.get("project", "")
@@ -473,14 +588,22 @@ def main(argv):
     config_handler(args.config, pbsync_config_parser_func)
     pblog.setup_logger(pbconfig.get("log_file_path"))
 
+    # Resolve the project selection once up front; the handlers below read
+    # the chosen project through the memoized config/pbunreal accessors
     uproject_name = pbconfig.get("uproject_name")
-    if not uproject_name.endswith(".uproject"):
+    is_multi_project = not uproject_name.endswith(".uproject")
+    if is_multi_project:
+        from pbpy import pbunreal
+
+        # all chdirs (debugpath, bootstrap) have happened by this point
+        cwd = Path.cwd()
+
         if not uproject_name:
-            projects_folder = Path.cwd()
+            projects_folder = cwd
             project_files = [list(projects_folder.glob("*.uproject"))[0]]
         else:
-            projects_folder = Path(uproject_name).resolve()
-            project_files = list(projects_folder.glob("*/*.uproject"))
+            projects_folder = (cwd / uproject_name).resolve()
+            project_files = _find_uprojects(projects_folder)
 
         if not project_files:
             error_state(
@@ -543,7 +666,7 @@ def main(argv):
                 uproject_file = project_files[0]
 
         if uproject_file:
-            uproject_file = uproject_file.relative_to(Path.cwd())
+            uproject_file = uproject_file.relative_to(cwd)
             pblog.success(f"Syncing project {uproject_file}.")
             pbunreal.select_uproject_name(str(uproject_file))
 
@@ -553,15 +676,9 @@ def main(argv):
             f"""Repository is currently in an error state. Please fix the issues in your workspace
         before running CliqueSync.\nIf you have already fixed the problem, you may remove {pbtools.error_file} from your project folder and
         run UpdateProject again.""",
-            True,
+            fatal_error=True,
         )
 
-    if len(sys.argv) < 2:
-        pblog.error("At least one valid argument should be passed!")
-        pblog.error("Did you mean to launch UpdateProject?")
-        input("Press enter to continue...")
-        error_state(hush=True)
-
     # Parse args
     if args.printversion is not None:
         printversion_handler(args.printversion)
@@ -580,8 +697,11 @@ def main(argv):
 
 
 if __name__ == "__main__":
-    multiprocessing.freeze_support()
-    if "Script" in os.getcwd():
+    # freeze_support is only meaningful for frozen Windows executables
+    if sys.platform == "win32":
+        multiprocessing.freeze_support()
+    cwd = os.getcwd()
+    if os.sep + "Script" in cwd:
         # Working directory fix for scripts calling CliqueSync from Script/Scripts folder
         os.chdir("..")
     main(sys.argv[1:])
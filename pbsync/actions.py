@@ -2,45 +2,80 @@ import os
 import shutil
 import sys
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from types import MappingProxyType
 
 from pbpy import pbconfig, pbgh, pbgit, pblog, pbtools, pbunreal
 from pbsync import prereqs
 
 actions = {}
+parallel_safe_actions = set()
+parallel_gates = {}
 action_pairs = {}
-active_pairs = {}
+independent_pairs = set()
+pair_pop_wrappers = []
 
 
-def register_action():
+def register_action(parallel_safe=False, parallel_gate=None):
+    # parallel_safe actions do not mutate shared state and may be overlapped
+    # with their neighbors at the head of a workflow; a parallel_gate lets an
+    # action veto the overlap per run, e.g. when it depends on state that a
+    # neighboring action may still be setting up
     def decorator(func):
         actions[func.__name__] = func
+        if parallel_safe:
+            parallel_safe_actions.add(func.__name__)
+            if parallel_gate is not None:
+                parallel_gates[func.__name__] = parallel_gate
         return func
 
     return decorator
 
 
-def register_action_pair(pop_func):
+def register_action_pair(pop_func, independent=False, parallel_gate=None):
+    # independent pairs may be pushed as soon as a workflow starts, letting
+    # their background work overlap every action ahead of them in the list;
+    # a parallel_gate can veto the eager launch per run, deferring the pair
+    # to its listed position
     def decorator(func):
         action_name = func.__name__
+        if independent:
+            independent_pairs.add(action_name)
+            if parallel_gate is not None:
+                parallel_gates[action_name] = parallel_gate
+        # The running handle lives in this closure rather than a shared dict,
+        # so each pair is self-contained and safe to drive from worker threads
+        handle = None
+        handle_lock = threading.Lock()
 
         def pop_wrapper():
-            if action_name in active_pairs:
-                result = pop_func(active_pairs[action_name])
-                del active_pairs[action_name]
-                return result
+            nonlocal handle
+            with handle_lock:
+                current, handle = handle, None
+            if current is not None:
+                return pop_func(current)
             return True
 
         def wrapper():
-            if action_name in active_pairs:
+            nonlocal handle
+            with handle_lock:
+                active = handle is not None
+            if active:
                 return pop_wrapper()
             result = func()
+            if result is None:
+                # the push had nothing to do; succeed with nothing to pop
+                return True
             if result:
-                active_pairs[action_name] = result
+                with handle_lock:
+                    handle = result
             return result
 
         action_pairs[action_name] = wrapper
         action_pairs[f"pop_{action_name}"] = pop_wrapper
+        pair_pop_wrappers.append(pop_wrapper)
         return func
 
     return decorator
@@ -49,32 +84,88 @@ def register_action_pair(pop_func):
 workflows = {}
 
 
+def finish_workflow():
+    # Pop any pairs left active so pushed state is never leaked; popping an
+    # inactive pair is a no-op
+    for pop_wrapper in pair_pop_wrappers:
+        if not pop_wrapper():
+            break
+
+
 def create_workflow(workflow_name: str, workflow_actions):
+    # Resolve names to callables here, once; the run-time loop then calls
+    # straight through a tuple instead of hashing two registries per step, and
+    # an unknown action fails at registration rather than mid-workflow
+    names = tuple(
+        action.__name__ if callable(action) else action
+        for action in workflow_actions
+    )
+    plan = []
+    for action in names:
+        if action in actions:
+            plan.append(actions[action])
+        elif action in action_pairs:
+            plan.append(action_pairs[action])
+        else:
+            raise ValueError(f"Action {action} not registered.")
+    plan = tuple(plan)
+
+    eager = tuple(dict.fromkeys(name for name in names if name in independent_pairs))
+
+    # The network-bound preflight actions at the head of a workflow are
+    # independent of each other, so overlap them in a small thread pool:
+    # their combined latency becomes max() rather than sum()
+    head_len = 0
+    while head_len < len(names) and names[head_len] in parallel_safe_actions:
+        head_len += 1
+    if head_len < 2:
+        head_len = 0
+
     def workflow():
         pblog.info("------------------")
-        for action in workflow_actions:
-            if callable(action):
-                action = action.__name__
-            if action in actions:
-                if not actions[action]():
-                    break
-            elif action in action_pairs:
-                if action in active_pairs:
-                    pop_action_name = f"pop_{action}"
-                    if not action_pairs[pop_action_name]():
-                        break
-                elif not action_pairs[action]():
-                    break
-            else:
-                raise ValueError(f"Action {action} not registered.")
 
+        # Push independent pairs right away so their background work overlaps
+        # the whole workflow; their first listed occurrence is skipped below so
+        # a later occurrence (or the final sweep) still pops them
+        launched = set()
+        for action in eager:
+            # a vetoed pair simply runs at its listed position instead, e.g.
+            # the LFS unlock must not start before git_prereqs has provided
+            # a working git-lfs
+            gate = parallel_gates.get(action)
+            if gate is not None and not gate():
+                continue
+            if action_pairs[action]():
+                launched.add(action)
+
+        # An action's gate can veto the overlap for this run only, e.g.
+        # git_check must not race git_prereqs while the prereqs are still
+        # missing; the serial loop below then preserves the listed order
+        run_head = head_len
+        if run_head and not all(
+            gate() for name in names[:run_head] if (gate := parallel_gates.get(name))
+        ):
+            run_head = 0
+
+        if run_head:
+            with ThreadPoolExecutor(max_workers=min(8, run_head)) as executor:
+                results = list(executor.map(lambda fn: fn(), plan[:run_head]))
+            if not all(results):
+                finish_workflow()
+                return
             pblog.info("------------------")
 
-        for action in active_pairs.keys():
-            pop_action_name = f"pop_{action}"
-            if not action_pairs[pop_action_name]():
+        for action, fn in zip(names[run_head:], plan[run_head:]):
+            if action in launched:
+                launched.discard(action)
+                continue
+            if not fn():
                 break
 
+            pblog.info("------------------")
+
+        finish_workflow()
+
     workflows[workflow_name] = workflow
     return workflow
 
@@ -86,12 +177,14 @@ def run_workflow(workflow_name):
         raise ValueError(f"Workflow {workflow_name} not registered.")
 
 
-@register_action()
+@register_action(parallel_safe=True)
 def git_prereqs():
     return prereqs.ensure_prereqs()
 
 
-@register_action()
+# overlapping with git_prereqs is only safe once git/LFS/GCM already exist,
+# since git_check shells out to the very binaries git_prereqs installs
+@register_action(parallel_safe=True, parallel_gate=prereqs.all_met)
 def git_check():
     # Check our remote connection before doing anything
     remote_state, remote_url = pbgit.check_remote_connection()
@@ -114,22 +207,16 @@ def git_check():
 
 @register_action()
 def git_ensure_clean():
-    status_out = pbtools.run_with_combined_output(
-        [pbgit.get_git_executable(), "status", "-uno"]
-    ).stdout
-    # continue a trivial rebase
-    if "rebase" in status_out:
-        if pbtools.it_has_any(
-            status_out,
-            "nothing to commit",
-            "git rebase --continue",
-            "all conflicts fixed",
-        ):
+    # Checking the rebase sentinel directories answers the common case without
+    # spawning git status and re-stating the whole working tree
+    if pbgit.is_rebase_in_progress():
+        # continue a trivial rebase: no unmerged entries left in the index
+        if not pbgit.has_unresolved_conflicts():
             pbunreal.ensure_ue_closed()
-            rebase_out = pbtools.run_with_combined_output(
+            proc = pbtools.run_with_combined_output(
                 [pbgit.get_git_executable(), "rebase", "--continue"]
-            ).stdout
-            if pbtools.it_has_any(rebase_out, "must edit all merge conflicts"):
+            )
+            if proc.returncode != 0:
                 # this is an improper state, since git told us otherwise before. abort all.
                 pbgit.abort_all()
         else:
@@ -145,13 +232,8 @@ def git_ensure_clean():
 @register_action()
 def git_fill_branches():
     # undo single branch clone
-    pbtools.run(
-        [
-            pbgit.get_git_executable(),
-            "config",
-            "remote.origin.fetch",
-            "+refs/heads/*:refs/remotes/origin/*",
-        ]
+    pbgit.set_config_batch(
+        [("remote.origin.fetch", "+refs/heads/*:refs/remotes/origin/*")]
     )
     return True
 
@@ -168,11 +250,42 @@ def git_sync():
     return True
 
 
+# Last verdict from pbgh.is_pull_binaries_required keyed by checksum-file
+# mtime; the manifest rarely changes between back-to-back checks, so a short
+# TTL skips the O(files) re-hash
+binaries_check_cache = {"mtime": None, "result": None, "ts": 0.0}
+
+
+def is_pull_binaries_required():
+    checksum_json_path = pbconfig.get("checksum_file")
+    try:
+        mtime = os.stat(checksum_json_path).st_mtime
+    except OSError:
+        mtime = None
+    now = time.monotonic()
+    if (
+        mtime is not None
+        and mtime == binaries_check_cache["mtime"]
+        and now - binaries_check_cache["ts"] < 10
+    ):
+        return binaries_check_cache["result"]
+    result = pbgh.is_pull_binaries_required()
+    binaries_check_cache["mtime"] = mtime
+    binaries_check_cache["result"] = result
+    binaries_check_cache["ts"] = now
+    return result
+
+
 @register_action()
 def pull_binaries():
-    project_version = pbunreal.get_project_version()
-    is_custom_version = pbunreal.is_using_custom_version()
-    needs_binaries_pull = pbgh.is_pull_binaries_required()
+    # Hashing every binary against the checksum manifest is the slow part of
+    # this action; overlap it with the project-version lookup, which only
+    # reads git metadata
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        needs_pull_future = executor.submit(is_pull_binaries_required)
+        project_version = pbunreal.get_project_version()
+        is_custom_version = pbunreal.is_using_custom_version()
+        needs_binaries_pull = needs_pull_future.result()
     if project_version is not None:
         if is_custom_version:
             pblog.info(f"User selected project version: {project_version}")
@@ -200,7 +313,7 @@ def pull_binaries():
         elif ret > 0:
             pbtools.error_state(
                 f"An error occurred while pulling binaries. Please request help from {pbconfig.get('support_channel')} to resolve it, and please do not run UpdateProject until the issue is resolved.",
-                True,
+                fatal_error=True,
             )
     else:
         pblog.success("Binaries are up to date!")
@@ -354,22 +467,36 @@ def ensure_symlinks():
     return True
 
 
-def pop_lfs_unlock_thread(fix_attr_thread):
+def pop_lfs_unlock_thread(fix_attr_future):
     pblog.info("Finishing LFS locks cleanup...")
-    fix_attr_thread.join()
+    # result() both joins the worker and surfaces any exception it raised,
+    # which a bare Thread.join would have swallowed
+    try:
+        fix_attr_future.result()
+    except Exception as e:
+        pblog.exception(str(e))
+        pblog.error("LFS locks cleanup failed.")
+        return False
     pblog.info("Finished LFS locks cleanup.")
     return True
 
 
-@register_action_pair(pop_func=pop_lfs_unlock_thread)
+@register_action_pair(
+    pop_func=pop_lfs_unlock_thread, independent=True, parallel_gate=prereqs.all_met
+)
 def lfs_unlock_thread():
-    configured_branches = pbconfig.get("branches")
+    configured_branches = frozenset(pbconfig.get("branches"))
     should_unlock_unmodified = pbgit.get_current_branch_name() in configured_branches
-    fix_attr_thread = threading.Thread(
-        target=pbgit.fix_lfs_ro_attr, args=(should_unlock_unmodified,)
-    )
-    fix_attr_thread.start()
-    return fix_attr_thread
+    # with no unmodified files to unlock and no lockable content on disk the
+    # fix-up is a no-op, so don't spin up a worker just to find that out
+    if not should_unlock_unmodified and not (
+        os.path.isdir("Content") or os.path.isdir("Plugins")
+    ):
+        return None
+    executor = ThreadPoolExecutor(max_workers=1)
+    fix_attr_future = executor.submit(pbgit.fix_lfs_ro_attr, should_unlock_unmodified)
+    executor.shutdown(wait=False)
+    return fix_attr_future
 
 
 @register_action()
@@ -434,12 +561,11 @@ def launch_project():
         os.startfile(pbunreal.get_sln_path())
     elif launch_pref == "rider":
         pblog.info("Launching Rider...")
-        # todo: do we need a replacement for this?
-        rider_bin = pbtools.get_one_line_output(["echo", "%Rider for Unreal Engine%"])
-        rider_bin = rider_bin.replace(";", "")
-        rider_bin = rider_bin.replace('"', "")
-        pbtools.run_non_blocking(
-            f'"{rider_bin}\\rider64.exe" "{str(pbunreal.get_sln_path().resolve())}"'
+        # the installer exposes the install dir as an environment variable, so
+        # read it directly instead of spawning a shell to echo-expand it
+        rider_bin = os.environ.get("Rider for Unreal Engine", "").strip('";')
+        pbtools.run_non_blocking_ex(
+            [f"{rider_bin}\\rider64.exe", str(pbunreal.get_sln_path().resolve())]
         )
     elif launch_pref == "editor":
         if pbunreal.is_ue_closed():
@@ -455,12 +581,14 @@ def launch_project():
                 pbtools.run_non_blocking_ex(launch_args)
             else:
                 launched_editor = False
-                if not pbunreal.check_ue_file_association():
+                association_ok = pbunreal.check_ue_file_association()
+                if not association_ok:
                     pblog.warning(
                         "CliqueSync failed to find a valid file association to launch the editor, attempting to resolve..."
                     )
                     pbunreal.run_unreal_setup()
-                if pbunreal.check_ue_file_association():
+                    association_ok = pbunreal.check_ue_file_association()
+                if association_ok:
                     try:
                         os.startfile(path)
                         launched_editor = True
@@ -469,7 +597,7 @@ def launch_project():
                         pass
                     except NotImplementedError:
                         if sys.platform.startswith("linux"):
-                            pbtools.run_non_blocking(f"xdg-open {path}")
+                            pbtools.run_non_blocking_ex(["xdg-open", path])
                             launched_editor = True
 
                 if not launched_editor:
@@ -491,3 +619,16 @@ def launch_project():
     else:
         pblog.info("No launch action selected, skipping launch.")
     return True
+
+
+def finalize_registrations():
+    # All actions are registered by decorators above; freeze the registries so
+    # nothing can shadow or replace an action after import. workflows stays
+    # mutable since create_workflow registers into it at run time.
+    global actions, action_pairs, parallel_gates
+    actions = MappingProxyType(actions)
+    action_pairs = MappingProxyType(action_pairs)
+    parallel_gates = MappingProxyType(parallel_gates)
+
+
+finalize_registrations()
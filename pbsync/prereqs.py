@@ -1,15 +1,57 @@
 from __future__ import annotations
 
+import fnmatch
 import os
-import sys
+import subprocess
+import threading
 import time
 import webbrowser
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Sequence
 
 from pbpy import pbconfig, pbgh, pbgit, pblog, pbtools, pbuac
-from pbpy.platform import PlatformSpecificLazyValue, PlatformSpecificValue
+from pbpy.platform import (
+    Platform,
+    PlatformSpecificLazyValue,
+    PlatformSpecificValue,
+    current_platform,
+)
+
+
+# PATH scans shell out per query; memoize them for the process and clear the
+# cache whenever an install may have added new binaries to PATH
+cached_whereis = lru_cache(maxsize=64)(pbtools.whereis)
+
+
+@lru_cache(maxsize=1)
+def _detect_managers() -> tuple[str, ...]:
+    """Ordered package managers available on this machine."""
+
+    def has(exe: str) -> bool:
+        return len(cached_whereis(exe)) > 0
+
+    managers: list[str] = []
+    # macOS tries brew first
+    if current_platform == Platform.DARWIN and has("brew"):
+        managers.append("brew")
+    # Linux managers (ordered by prevalence)
+    if has("apt-get"):
+        managers.append("apt")
+    if has("dnf"):
+        managers.append("dnf")
+    if has("yum"):
+        managers.append("yum")
+    if has("zypper"):
+        managers.append("zypper")
+    if has("pacman"):
+        managers.append("pacman")
+    # Homebrew last on Linux
+    if current_platform != Platform.DARWIN and has("brew"):
+        managers.append("brew")
+    return tuple(managers)
 
 
 class GenericInstaller:
@@ -45,32 +87,41 @@ class ReleaseInstaller(GenericInstaller):
         )
         repo_url = f"{self.spec.host}/{self.spec.repo}"
 
+        # One CLI invocation for every candidate pattern: the provider resolves
+        # the release (including a "latest" tag) once instead of per asset
+        res = pbgh.download_release_file(
+            (
+                None
+                if (self.version_tag is None or self.version_tag == "latest")
+                else self.version_tag
+            ),
+            list(patterns),
+            directory=directory,
+            repo=repo_url,
+        )
+        if res != 0:
+            return None
+        # One directory read shared by every pattern; globbing per pattern
+        # would re-stat the whole download directory each time
+        with os.scandir(directory) as it:
+            entries = [entry for entry in it if entry.is_file()]
         for pat in patterns:
-            res = pbgh.download_release_file(
-                (
-                    None
-                    if (self.version_tag is None or self.version_tag == "latest")
-                    else self.version_tag
-                ),
-                pat,
-                directory=directory,
-                repo=repo_url,
-            )
-            if res == 0:
-                if "*" in pat:
-                    for path in Path(directory).glob(pat):
-                        if path.is_file():
-                            return path
-                    return None
-                return Path(directory) / pat
+            if "*" in pat:
+                for entry in entries:
+                    if fnmatch.fnmatchcase(entry.name, pat):
+                        return Path(entry.path)
+            else:
+                for entry in entries:
+                    if entry.name == pat:
+                        return Path(entry.path)
         return None
 
     def _execute_installer(self, installer_path: Path) -> bool:
         try:
-            if os.name == "nt":
+            if current_platform == Platform.WINDOWS:
                 proc = pbtools.run([str(installer_path)])
                 return proc.returncode == 0
-            elif sys.platform == "darwin":
+            elif current_platform == Platform.DARWIN:
                 # Prefer opening with the system installer
                 if installer_path.suffix == ".pkg":
                     proc = pbtools.run(["open", str(installer_path)])
@@ -123,11 +174,67 @@ class ReleaseInstaller(GenericInstaller):
         finally:
             # Best-effort cleanup
             try:
-                os.remove(installer_path)
+                os.remove(os.fspath(installer_path))
             except Exception:
                 pass
 
 
+@dataclass(frozen=True)
+class MgrOps:
+    """Command shapes for one package manager; package names get appended."""
+
+    install_cmd: tuple[str, ...]
+    needs_sudo: bool = True
+    refresh_cmd: Optional[tuple[str, ...]] = None
+    env: Optional[dict[str, str]] = None
+    # lowercase output markers meaning a requested package does not exist in
+    # this manager's repos, as opposed to a systemic failure
+    not_found: tuple[str, ...] = ()
+
+
+# System package managers hold a machine-wide database lock and fail (rather
+# than wait) when it is contended, so concurrent prereq installs must take
+# their package-manager transactions one at a time
+_package_manager_lock = threading.Lock()
+
+# git config writes take ~/.gitconfig.lock and fail instead of waiting when it
+# is held, so the config-writing tails of concurrent installs serialize here
+_git_config_lock = threading.Lock()
+
+_MGR_OPS: dict[str, MgrOps] = {
+    # Homebrew does not use sudo
+    "brew": MgrOps(
+        ("brew", "install"),
+        needs_sudo=False,
+        refresh_cmd=("brew", "update"),
+        not_found=("no available formula", "no formulae found"),
+    ),
+    "apt": MgrOps(
+        ("apt-get", "install", "-y"),
+        refresh_cmd=("apt-get", "update"),
+        env={"DEBIAN_FRONTEND": "noninteractive"},
+        not_found=("unable to locate package",),
+    ),
+    "dnf": MgrOps(
+        ("dnf", "install", "-y"),
+        not_found=("no match for argument", "unable to find a match"),
+    ),
+    "yum": MgrOps(
+        ("yum", "install", "-y"),
+        not_found=("no match for argument", "no package", "nothing to do"),
+    ),
+    "zypper": MgrOps(
+        ("zypper", "--non-interactive", "install"),
+        not_found=("not found in package names",),
+    ),
+    "pacman": MgrOps(
+        ("pacman", "-S", "--noconfirm"),
+        refresh_cmd=("pacman", "-Sy"),
+        not_found=("target not found",),
+    ),
+}
+
+
 class PosixPackageInstaller(GenericInstaller):
     """Installs packages via available POSIX package manager (Linux/macOS).
 
@@ -153,83 +260,93 @@ class PosixPackageInstaller(GenericInstaller):
             return cmd
         return ["sudo", "-n"] + cmd
 
-    def _has(self, exe: str) -> bool:
-        return len(pbtools.whereis(exe)) > 0
-
     def install(self) -> bool:
-        if os.name != "posix":
+        if current_platform == Platform.WINDOWS:
             return False
 
-        managers: list[str] = []
-        # macOS tries brew first
-        if sys.platform == "darwin" and self._has("brew"):
-            managers.append("brew")
-        # Linux managers (ordered by prevalence)
-        if self._has("apt-get"):
-            managers.append("apt")
-        if self._has("dnf"):
-            managers.append("dnf")
-        if self._has("yum"):
-            managers.append("yum")
-        if self._has("zypper"):
-            managers.append("zypper")
-        if self._has("pacman"):
-            managers.append("pacman")
-        # Homebrew last on Linux
-        if sys.platform != "darwin" and self._has("brew"):
-            managers.append("brew")
-
-        for mgr in managers:
-            for pkg in self.package_candidates:
-                try:
-                    if mgr == "brew":
-                        # Homebrew does not use sudo
-                        pbtools.run(["brew", "update"])  # best effort
-                        proc = pbtools.run(["brew", "install", pkg])
-                        if proc.returncode == 0:
-                            return True
-                    elif mgr == "apt":
-                        # refresh then install
-                        env = {"DEBIAN_FRONTEND": "noninteractive"}
-                        pbtools.run(self._prefix_sudo(["apt-get", "update"]))
-                        proc = pbtools.run(
-                            self._prefix_sudo(["apt-get", "install", "-y", pkg]),
-                            env=env,
-                        )
-                        if proc.returncode == 0:
-                            return True
-                    elif mgr == "dnf":
-                        proc = pbtools.run(
-                            self._prefix_sudo(["dnf", "install", "-y", pkg])
-                        )
-                        if proc.returncode == 0:
-                            return True
-                    elif mgr == "yum":
-                        proc = pbtools.run(
-                            self._prefix_sudo(["yum", "install", "-y", pkg])
-                        )
-                        if proc.returncode == 0:
-                            return True
-                    elif mgr == "zypper":
-                        proc = pbtools.run(
-                            self._prefix_sudo(
-                                ["zypper", "--non-interactive", "install", pkg]
-                            )
-                        )
-                        if proc.returncode == 0:
-                            return True
-                    elif mgr == "pacman":
-                        # refresh then install
-                        pbtools.run(self._prefix_sudo(["pacman", "-Sy"]))
-                        proc = pbtools.run(
-                            self._prefix_sudo(["pacman", "-S", "--noconfirm", pkg])
-                        )
-                        if proc.returncode == 0:
-                            return True
-                except Exception as e:
-                    pblog.exception(str(e))
-                    continue
-        return False
+        managers = _detect_managers()
+
+        # Concurrent prereq installs funnel in here; hold the transaction lock
+        # for the whole refresh+install sequence so two installers never race
+        # each other on the package-db lock
+        with _package_manager_lock:
+            # Metadata refreshes are pure network fetches: start them in the
+            # background so they overlap each other instead of serializing
+            # ahead of every install attempt, and join each one just before
+            # its install
+            refresh_procs = {mgr: self._start_refresh(mgr) for mgr in managers}
+            try:
+                for mgr in managers:
+                    self._wait_refresh(refresh_procs.pop(mgr, None))
+                    # One transaction covering every candidate: a single fork and a
+                    # single package-db lock/rebuild instead of one per package
+                    proc = self._run_install(mgr, self.package_candidates)
+                    if proc is not None and proc.returncode == 0:
+                        return True
+                    # Retry candidates individually only when the batch failed
+                    # because one doesn't exist in this manager's repos; a
+                    # systemic failure (sudo, network) would just fail again
+                    if (
+                        len(self.package_candidates) > 1
+                        and proc is not None
+                        and self._is_not_found(mgr, proc.stdout)
+                    ):
+                        for pkg in self.package_candidates:
+                            single = self._run_install(mgr, [pkg])
+                            if single is not None and single.returncode == 0:
+                                return True
+                return False
+            finally:
+                # Don't orphan refreshes for managers we never reached
+                for proc in refresh_procs.values():
+                    self._wait_refresh(proc)
+
+    def _start_refresh(self, mgr: str) -> Optional[subprocess.Popen]:
+        ops = _MGR_OPS[mgr]
+        if ops.refresh_cmd is None:
+            return None
+        cmd = list(ops.refresh_cmd)
+        if ops.needs_sudo:
+            cmd = self._prefix_sudo(cmd)
+        try:
+            return pbtools.run_background(cmd)  # best effort
+        except Exception as e:
+            pblog.exception(str(e))
+            return None
+
+    def _wait_refresh(self, proc: Optional[subprocess.Popen]):
+        if proc is None:
+            return
+        try:
+            proc.wait()
+        except Exception as e:
+            pblog.exception(str(e))
+
+    def _run_install(
+        self, mgr: str, pkgs: Sequence[str]
+    ) -> Optional[subprocess.CompletedProcess]:
+        ops = _MGR_OPS.get(mgr)
+        if ops is None:
+            return None
+        cmd = [*ops.install_cmd, *pkgs]
+        if ops.needs_sudo:
+            cmd = self._prefix_sudo(cmd)
+        try:
+            # capture the output so the caller can tell a missing package
+            # apart from a systemic failure
+            proc = pbtools.run_with_combined_output(cmd, env=ops.env)
+            if proc.returncode != 0 and proc.stdout:
+                pblog.info(proc.stdout)
+            return proc
+        except Exception as e:
+            pblog.exception(str(e))
+            return None
+
+    def _is_not_found(self, mgr: str, output: Optional[str]) -> bool:
+        if not output:
+            return False
+        lowered = output.lower()
+        return any(marker in lowered for marker in _MGR_OPS[mgr].not_found)
 
 
 class GenericPrereq:
@@ -244,6 +361,9 @@ class GenericPrereq:
     def install(self) -> bool:
         raise NotImplementedError()
 
+    def invalidate(self) -> None:
+        """Drop any cached probe results, e.g. after a (re)install."""
+
 
 class VersionedPrereq(GenericPrereq):
     """Prereq that has a supported version and an installed version."""
@@ -251,6 +371,8 @@ class VersionedPrereq(GenericPrereq):
     def __init__(self, display: str, match_mode: str = "exact"):
         super().__init__(display)
         self.match_mode = match_mode
+        self._installed_version: Optional[str] = None
+        self._installed_version_known = False
 
     def get_supported_version(self) -> Optional[str]:
         return None
@@ -258,9 +380,20 @@ class VersionedPrereq(GenericPrereq):
     def get_installed_version(self) -> Optional[str]:
         return None
 
+    def installed_version(self) -> Optional[str]:
+        # Version probes shell out to the tool; do it once per instance
+        if not self._installed_version_known:
+            self._installed_version = self.get_installed_version()
+            self._installed_version_known = True
+        return self._installed_version
+
+    def invalidate(self) -> None:
+        super().invalidate()
+        self._installed_version_known = False
+
     def is_met(self, hush=False) -> bool:
         supported_version = self.get_supported_version()
-        installed_version = self.get_installed_version()
+        installed_version = self.installed_version()
 
         ret = False
 
@@ -283,7 +416,7 @@ class VersionedPrereq(GenericPrereq):
         if not hush:
             if ret:
                 pblog.info(
-                    f"Current {self.__class__.__name__} version: {self.get_installed_version()}"
+                    f"Current {self.__class__.__name__} version: {installed_version}"
                 )
             else:
                 if supported_version and installed_version:
@@ -342,7 +475,7 @@ class GitPrereq(VersionedPrereq):
 
         ok = linstall() is True
         if ok:
-            if os.name == "nt":
+            if current_platform == Platform.WINDOWS:
                 # Reconfigure GCM path
                 gcm_bin = pbgit.get_gcm_executable()
                 if gcm_bin:
@@ -367,7 +500,7 @@ class GitLFSPrereq(VersionedPrereq):
 
         Returns True if cleanup succeeded or not needed; False if conflicting binaries remain.
         """
-        if os.name != "nt":
+        if current_platform != Platform.WINDOWS:
             return True
         # Only attempt cleanup when using PATH-based executables (no custom overrides)
         if (
@@ -377,44 +510,45 @@ class GitLFSPrereq(VersionedPrereq):
             return True
 
         # Find git.exe under .../Git/cmd/git.exe to infer install root(s)
-        git_paths = [path for path in pbtools.whereis("git") if "cmd" in path.parts]
+        git_paths = [path for path in cached_whereis("git") if "cmd" in path.parts]
         if not git_paths:
             return True
 
-        bundled_git_lfs = False
-        is_admin = pbuac.is_user_admin()
+        # Collect every existing bundled binary first, then delete them all
+        # with one invocation instead of a stat/unlink round trip per path
+        possible_lfs_paths = [
+            "cmd/git-lfs.exe",
+            "mingw64/bin/git-lfs.exe",
+            "mingw64/libexec/git-core/git-lfs.exe",
+        ]
         delete_paths: list[str] = []
-
         for git_path in git_paths:
             # find Git from Git/cmd/git.exe
             try:
                 git_root = git_path.parents[1]
             except IndexError:
                 continue
-            possible_lfs_paths = [
-                "cmd/git-lfs.exe",
-                "mingw64/bin/git-lfs.exe",
-                "mingw64/libexec/git-core/git-lfs.exe",
-            ]
             for rel in possible_lfs_paths:
                 path = git_root / rel
                 if path.exists():
-                    try:
-                        if is_admin:
-                            path.unlink(missing_ok=True)
-                        else:
-                            delete_paths.append(str(path))
-                    except FileNotFoundError:
-                        pass
-                    except OSError:
-                        bundled_git_lfs = True
-                        delete_paths.append(str(path))
-
-        if not bundled_git_lfs and not is_admin and delete_paths:
+                    delete_paths.append(str(path))
+
+        if not delete_paths:
+            return True
+
+        if pbuac.is_user_admin():
+            # unquoted on purpose: list2cmdline quotes the paths when building
+            # the command line, and pre-quoting gets re-escaped into no-matches
+            pbtools.run_with_combined_output(
+                ["cmd.exe", "/c", "DEL", "/q", "/f"] + delete_paths
+            )
+        else:
             pblog.info(
                 "Requesting admin permission to delete bundled Git LFS which is overriding your installed version..."
             )
             time.sleep(1)
+            # the elevated command line is pre-joined into one string, so the
+            # paths need explicit quoting here
             quoted_paths = [f'"{p}"' for p in delete_paths]
             delete_cmdline = ["cmd.exe", "/c", "DEL", "/q", "/f"] + quoted_paths
             try:
@@ -429,12 +563,12 @@ class GitLFSPrereq(VersionedPrereq):
                 )
 
         # Verify deletion; if any remain, we must stop and ask user to remove
+        bundled_git_lfs = False
         for delete_path in delete_paths:
-            path = Path(delete_path)
-            if path.exists():
+            if os.path.exists(delete_path):
                 bundled_git_lfs = True
                 pblog.error(
-                    f"Git LFS is bundled with Git, overriding your installed version. Please remove {path}."
+                    f"Git LFS is bundled with Git, overriding your installed version. Please remove {delete_path}."
                 )
 
         return not bundled_git_lfs
@@ -473,11 +607,15 @@ class GitLFSPrereq(VersionedPrereq):
             # Configure LFS hooks for the user
             current_drive = Path().resolve()
             drive_root = current_drive.drive or current_drive.root
-            pbtools.run([pbgit.get_lfs_executable(), "install"], cwd=drive_root)
+            with _git_config_lock:
+                pbtools.run([pbgit.get_lfs_executable(), "install"], cwd=drive_root)
 
             # Check if Git LFS was installed to a different path (Windows only)
-            if os.name == "nt" and pbgit.get_lfs_executable() == "git-lfs":
-                git_lfs_paths = [path for path in pbtools.whereis("git-lfs")]
+            if (
+                current_platform == Platform.WINDOWS
+                and pbgit.get_lfs_executable() == "git-lfs"
+            ):
+                git_lfs_paths = [path for path in cached_whereis("git-lfs")]
                 if len(git_lfs_paths) > 1:
                     index = 0
                     main_lfs_path = git_lfs_paths[0]
@@ -533,33 +671,34 @@ class GitCredentialManagerPrereq(VersionedPrereq):
 
     def _unset_all_credential_helpers(self):
         """Remove any configured credential.helper entries (local and global)."""
-        try:
-            pbtools.run_with_combined_output(
-                [
-                    pbgit.get_git_executable(),
-                    "config",
-                    "--unset-all",
-                    "credential.helper",
-                ]
-            )
-        except Exception:
-            pass
-        try:
-            pbtools.run_with_combined_output(
-                [
-                    pbgit.get_git_executable(),
-                    "config",
-                    "--global",
-                    "--unset-all",
-                    "credential.helper",
-                ]
-            )
-        except Exception:
-            pass
+        with _git_config_lock:
+            try:
+                pbtools.run_with_combined_output(
+                    [
+                        pbgit.get_git_executable(),
+                        "config",
+                        "--unset-all",
+                        "credential.helper",
+                    ]
+                )
+            except Exception:
+                pass
+            try:
+                pbtools.run_with_combined_output(
+                    [
+                        pbgit.get_git_executable(),
+                        "config",
+                        "--global",
+                        "--unset-all",
+                        "credential.helper",
+                    ]
+                )
+            except Exception:
+                pass
 
     def install(self) -> bool:
         supported = self.get_supported_version()
-        detected = self.get_installed_version()
+        detected = self.installed_version()
 
         # If a conflicting credential helper is configured, clear it first
         if isinstance(detected, str) and detected.startswith("diff"):
@@ -610,7 +749,8 @@ class GitCredentialManagerPrereq(VersionedPrereq):
         # (Re)configure GCM and verify
         gcm_bin = pbgit.get_gcm_executable()
         if gcm_bin:
-            pbtools.run([*gcm_bin, "configure"])
+            with _git_config_lock:
+                pbtools.run([*gcm_bin, "configure"])
 
         # If a specific version is required, ensure it matches; otherwise just ensure some GCM is active
         if supported:
@@ -626,6 +766,17 @@ class GitCredentialManagerPrereq(VersionedPrereq):
         return ok
 
 
+def all_met() -> bool:
+    """Quick probe for whether every default prerequisite is already satisfied."""
+    try:
+        return all(
+            prereq.is_met(hush=True)
+            for prereq in (GitPrereq(), GitLFSPrereq(), GitCredentialManagerPrereq())
+        )
+    except Exception:
+        return False
+
+
 def ensure_prereqs(prereqs: Optional[Sequence[GenericPrereq]] = None) -> bool:
     """Checks and installs required prerequisites.
 
@@ -634,18 +785,44 @@ def ensure_prereqs(prereqs: Optional[Sequence[GenericPrereq]] = None) -> bool:
     if prereqs is None:
         prereqs = [GitPrereq(), GitLFSPrereq(), GitCredentialManagerPrereq()]
 
+    def install_one(prereq: GenericPrereq) -> bool:
+        name = prereq.__class__.__name__
+        pblog.info(f"Installing prerequisite: {name}...")
+        try:
+            ok = prereq.install()
+        except Exception as e:
+            pblog.exception(str(e))
+            return False
+        if ok:
+            # the install may have put new binaries on PATH
+            cached_whereis.cache_clear()
+            _detect_managers.cache_clear()
+            prereq.invalidate()
+        else:
+            pblog.error(f"Failed to install prerequisite: {name}.")
+        return ok
+
+    # The is_met checks are cheap; run them serially to find what needs work
     all_ok = True
+    pending: list[GenericPrereq] = []
     for prereq in prereqs:
         try:
-            if prereq.is_met():
-                continue
-            name = prereq.__class__.__name__
-            pblog.info(f"Installing prerequisite: {name}...")
-            ok = prereq.install()
-            if not ok:
-                pblog.error(f"Failed to install prerequisite: {name}.")
-                all_ok = False
+            if not prereq.is_met():
+                pending.append(prereq)
         except Exception as e:
             pblog.exception(str(e))
             all_ok = False
+
+    # Git has to land before the tools that hook into it, but the remaining
+    # installs are independent downloads that can overlap each other
+    if pending and isinstance(pending[0], GitPrereq):
+        all_ok = install_one(pending[0]) and all_ok
+        pending = pending[1:]
+
+    if len(pending) > 1:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            all_ok = all(list(executor.map(install_one, pending))) and all_ok
+    elif pending:
+        all_ok = install_one(pending[0]) and all_ok
+
     return all_ok